@@ -21,10 +21,49 @@ to the agent.
 """
 
 
+import functools
+import operator
+
 import numpy as np
 
 from gfootball.env import football_action_set
 
+_FLIPPED_DIRECTIONS = {
+    football_action_set.action_left: football_action_set.action_right,
+    football_action_set.action_top_left: football_action_set.action_bottom_right,
+    football_action_set.action_top: football_action_set.action_bottom,
+    football_action_set.action_top_right: football_action_set.action_bottom_left,
+    football_action_set.action_right: football_action_set.action_left,
+    football_action_set.action_bottom_right: football_action_set.action_top_left,
+    football_action_set.action_bottom: football_action_set.action_top,
+    football_action_set.action_bottom_left: football_action_set.action_top_right,
+}
+
+# Indexed by `ball_owned_team + 1`: nobody (-1) stays -1, left (0) and right (1) swap.
+_FLIPPED_BALL_OWNED_TEAM = (-1, 1, 0)
+
+# (left, right) key pairs of the team-specific observations swapped when flipping.
+_TEAM_POINT_KEYS = tuple((f"left_{field}", f"right_{field}") for field in ("team", "team_direction"))
+_TEAM_KEYS = tuple(
+    (f"left_{field}", f"right_{field}")
+    for field in (
+        "team_tired_factor",
+        "team_active",
+        "team_yellow_card",
+        "team_roles",
+        "team_designated_player",
+    )
+)
+# (from, to) key pairs of the optional agent-specific observations.
+_AGENT_CONTROLLED_PLAYER_KEYS = (
+    ("left_agent_controlled_player", "right_agent_controlled_player"),
+    ("right_agent_controlled_player", "left_agent_controlled_player"),
+)
+_AGENT_STICKY_ACTIONS_KEYS = (
+    ("left_agent_sticky_actions", "right_agent_sticky_actions"),
+    ("right_agent_sticky_actions", "left_agent_sticky_actions"),
+)
+
 
 def rotate_3d_point(point):
     """Rotate 3d point around the center of the field.
@@ -66,33 +105,39 @@ def rotate_sticky_actions(sticky_actions_state, config):
       Array of bits corresponding to the same active actions for a player
       who would play from the opposite side.
     """
+    permutation = _sticky_actions_permutation(config["action_set"])
+    assert len(permutation) == len(sticky_actions_state), len(permutation)
+    return np.asarray(sticky_actions_state)[permutation]
+
+
+@functools.lru_cache(maxsize=8)
+def _sticky_actions_permutation(action_set_name):
+    """Returns, for each sticky slot, the slot holding its flipped action.
+
+    The permutation only depends on the action set, so it is computed once
+    per action set instead of on every observation flip.
+    """
+    config = {"action_set": action_set_name}
     sticky_actions = football_action_set.get_sticky_actions(config)
-    assert len(sticky_actions) == len(sticky_actions_state), len(sticky_actions)
-    action_to_state = {}
-    for i in range(len(sticky_actions)):
-        action_to_state[sticky_actions[i]] = sticky_actions_state[i]
-    rotated_sticky_actions = []
-    for i in range(len(sticky_actions)):
-        rotated_sticky_actions.append(action_to_state[flip_single_action(sticky_actions[i], config)])
-    return rotated_sticky_actions
-
-
-def flip_team_observation(observation, result, config, from_team, to_team):
-    """Rotates team-specific observations."""
-    result[f"{to_team}_team"] = rotate_points(observation[f"{from_team}_team"])
-    result[f"{to_team}_team_direction"] = rotate_points(observation[f"{from_team}_team_direction"])
-    result[f"{to_team}_team_tired_factor"] = observation[f"{from_team}_team_tired_factor"]
-    result[f"{to_team}_team_active"] = observation[f"{from_team}_team_active"]
-    result[f"{to_team}_team_yellow_card"] = observation[f"{from_team}_team_yellow_card"]
-    result[f"{to_team}_team_roles"] = observation[f"{from_team}_team_roles"]
-    result[f"{to_team}_team_active"] = observation[f"{from_team}_team_active"]
-    result[f"{to_team}_team_designated_player"] = observation[f"{from_team}_team_designated_player"]
-    if f"{from_team}_agent_controlled_player" in observation:
-        result[f"{to_team}_agent_controlled_player"] = observation[f"{from_team}_agent_controlled_player"]
-    if f"{from_team}_agent_sticky_actions" in observation:
-        result[f"{to_team}_agent_sticky_actions"] = [
-            rotate_sticky_actions(sticky, config) for sticky in observation[f"{from_team}_agent_sticky_actions"]
-        ]
+    action_to_index = {action: i for i, action in enumerate(sticky_actions)}
+    permutation = np.array([action_to_index[_FLIPPED_DIRECTIONS.get(action, action)] for action in sticky_actions])
+    permutation.flags.writeable = False
+    return permutation
+
+
+def _swap_team_observations(observation, result, config):
+    """Rotates team-specific observations, swapping the left and right teams in one pass."""
+    for left, right in _TEAM_POINT_KEYS:
+        result[left], result[right] = rotate_points(observation[right]), rotate_points(observation[left])
+    for left, right in _TEAM_KEYS:
+        result[left], result[right] = observation[right], observation[left]
+    for from_key, to_key in _AGENT_CONTROLLED_PLAYER_KEYS:
+        if from_key in observation:
+            result[to_key] = observation[from_key]
+    for from_key, to_key in _AGENT_STICKY_ACTIONS_KEYS:
+        if from_key in observation:
+            rotated = [rotate_sticky_actions(sticky, config) for sticky in observation[from_key]]
+            result[to_key] = np.stack(rotated) if rotated else rotated
 
 
 def flip_observation(observation, config):
@@ -101,41 +146,39 @@ def flip_observation(observation, config):
     flipped_observation["ball"] = rotate_3d_point(observation["ball"])
     flipped_observation["ball_direction"] = rotate_3d_point(observation["ball_direction"])
     flipped_observation["ball_rotation"] = observation["ball_rotation"]
-    flipped_observation["ball_owned_team"] = (
-        1 - observation["ball_owned_team"] if observation["ball_owned_team"] > -1 else -1
-    )
+    flipped_observation["ball_owned_team"] = _FLIPPED_BALL_OWNED_TEAM[observation["ball_owned_team"] + 1]
     flipped_observation["ball_owned_player"] = observation["ball_owned_player"]
-    flipped_observation["score"] = [observation["score"][1], observation["score"][0]]
+    flipped_observation["score"] = list(observation["score"][::-1])
     flipped_observation["game_mode"] = observation["game_mode"]
     flipped_observation["steps_left"] = observation["steps_left"]
-    flip_team_observation(observation, flipped_observation, config, "left", "right")
-    flip_team_observation(observation, flipped_observation, config, "right", "left")
+    _swap_team_observations(observation, flipped_observation, config)
     return flipped_observation
 
 
 def flip_single_action(action, config):
     """Actions corresponding to the field rotated by 180 degrees."""
+    if isinstance(action, (int, np.integer)):
+        flipped_action_set = _flipped_action_set(config["action_set"])
+        index = operator.index(action)
+        assert 0 <= index < len(flipped_action_set), "Action outside of action set"
+        return flipped_action_set[index]
     action = football_action_set.named_action_from_action_set(football_action_set.get_action_set(config), action)
-    if action == football_action_set.action_left:
-        return football_action_set.action_right
-    if action == football_action_set.action_top_left:
-        return football_action_set.action_bottom_right
-    if action == football_action_set.action_top:
-        return football_action_set.action_bottom
-    if action == football_action_set.action_top_right:
-        return football_action_set.action_bottom_left
-    if action == football_action_set.action_right:
-        return football_action_set.action_left
-    if action == football_action_set.action_bottom_right:
-        return football_action_set.action_top_left
-    if action == football_action_set.action_bottom:
-        return football_action_set.action_top
-    if action == football_action_set.action_bottom_left:
-        return football_action_set.action_top_right
-    return action
+    return _FLIPPED_DIRECTIONS.get(action, action)
+
+
+@functools.lru_cache(maxsize=8)
+def _flipped_action_set(action_set_name):
+    """Lookup table from an action index to the flipped named action."""
+    action_set = football_action_set.action_set_dict[action_set_name]
+    flipped_action_set = np.empty(len(action_set), dtype=object)
+    flipped_action_set[:] = [_FLIPPED_DIRECTIONS.get(action, action) for action in action_set]
+    flipped_action_set.flags.writeable = False
+    return flipped_action_set
 
 
 def flip_action(action, config):
+    if isinstance(action, np.ndarray) and np.issubdtype(action.dtype, np.integer):
+        return _flipped_action_set(config["action_set"])[action].tolist()
     if isinstance(action, np.ndarray) or isinstance(action, list):
         return [flip_single_action(a, config) for a in action]
     return flip_single_action(action, config)
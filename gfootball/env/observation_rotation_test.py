@@ -21,43 +21,59 @@ from absl.testing import absltest
 from gfootball.env import config, football_action_set, observation_rotation
 
 
+def _random_observation():
+    num_players = 11
+    observation = {}
+    observation["left_team"] = np.random.rand(num_players * 2) - 0.5
+    observation["left_team_roles"] = np.random.rand(num_players)
+    observation["left_team_direction"] = np.random.rand(num_players * 2) - 0.5
+    observation["left_team_tired_factor"] = np.random.rand(num_players)
+    observation["left_team_yellow_card"] = np.random.rand(num_players)
+    observation["left_team_active"] = [3]
+    observation["left_team_designated_player"] = 3
+    observation["right_team"] = np.random.rand(num_players * 2) - 0.5
+    observation["right_team_roles"] = np.random.rand(num_players)
+    observation["right_team_direction"] = np.random.rand(num_players * 2) - 0.5
+    observation["right_team_tired_factor"] = np.random.rand(num_players)
+    observation["right_team_yellow_card"] = np.random.rand(num_players)
+    observation["right_team_active"] = [0]
+    observation["right_team_designated_player"] = 0
+    observation["ball"] = np.array([1, -1, 0])
+    observation["ball_direction"] = np.random.rand(3) - 0.5
+    observation["ball_rotation"] = np.random.rand(3) - 0.5
+    observation["ball_owned_team"] = 0
+    observation["ball_owned_player"] = 7
+    observation["left_agent_controlled_player"] = [4]
+    observation["right_agent_controlled_player"] = [6]
+    observation["game_mode"] = 123
+    observation["left_agent_sticky_actions"] = np.random.randint(2, size=(1, 10), dtype=np.uint8)
+    observation["right_agent_sticky_actions"] = np.random.randint(2, size=(1, 10), dtype=np.uint8)
+    observation["score"] = [3, 5]
+    observation["steps_left"] = 45
+    return observation
+
+
 class ObservationRotationTest(absltest.TestCase):
 
     def testObservationFlipping(self):
         cfg = config.Config()
-        num_players = 11
-        observation = {}
-        observation["left_team"] = np.random.rand(num_players * 2) - 0.5
-        observation["left_team_roles"] = np.random.rand(num_players)
-        observation["left_team_direction"] = np.random.rand(num_players * 2) - 0.5
-        observation["left_team_tired_factor"] = np.random.rand(num_players)
-        observation["left_team_yellow_card"] = np.random.rand(num_players)
-        observation["left_team_active"] = [3]
-        observation["left_team_designated_player"] = 3
-        observation["right_team"] = np.random.rand(num_players * 2) - 0.5
-        observation["right_team_roles"] = np.random.rand(num_players)
-        observation["right_team_direction"] = np.random.rand(num_players * 2) - 0.5
-        observation["right_team_tired_factor"] = np.random.rand(num_players)
-        observation["right_team_yellow_card"] = np.random.rand(num_players)
-        observation["right_team_active"] = [0]
-        observation["right_team_designated_player"] = 0
-        observation["ball"] = np.array([1, -1, 0])
-        observation["ball_direction"] = np.random.rand(3) - 0.5
-        observation["ball_rotation"] = np.random.rand(3) - 0.5
-        observation["ball_owned_team"] = 0
-        observation["ball_owned_player"] = 7
-        observation["left_agent_controlled_player"] = [4]
-        observation["right_agent_controlled_player"] = [6]
-        observation["game_mode"] = 123
-        observation["left_agent_sticky_actions"] = [[np.random.rand(2) for _ in range(10)]]
-        observation["right_agent_sticky_actions"] = [[np.random.rand(2) for _ in range(10)]]
-        observation["score"] = [3, 5]
-        observation["steps_left"] = 45
+        observation = _random_observation()
         # Flipping twice the observation is the identity.
         flipped_observation = observation_rotation.flip_observation(observation, cfg)
         original_observation = observation_rotation.flip_observation(flipped_observation, cfg)
         self.assertEqual(str(tuple(sorted(original_observation.items()))), str(tuple(sorted(observation.items()))))
 
+    def testStickyActionsRotation(self):
+        cfg = config.Config()
+        sticky_actions = football_action_set.get_sticky_actions(cfg)
+        state = np.zeros(len(sticky_actions), dtype=np.uint8)
+        state[sticky_actions.index(football_action_set.action_top_left)] = 1
+        state[sticky_actions.index(football_action_set.action_sprint)] = 1
+        expected = np.zeros(len(sticky_actions), dtype=np.uint8)
+        expected[sticky_actions.index(football_action_set.action_bottom_right)] = 1
+        expected[sticky_actions.index(football_action_set.action_sprint)] = 1
+        np.testing.assert_array_equal(observation_rotation.rotate_sticky_actions(state, cfg), expected)
+
     def testActionFlipping(self):
         cfg = config.Config()
         for action in football_action_set.full_action_set:
@@ -67,6 +83,16 @@ class ObservationRotationTest(absltest.TestCase):
             )
             self.assertEqual(action, action_id)
 
+    def testActionIndexFlipping(self):
+        cfg = config.Config()
+        action_set = football_action_set.get_action_set(cfg)
+        expected = [observation_rotation.flip_single_action(action, cfg) for action in action_set]
+        for index in range(len(action_set)):
+            self.assertEqual(expected[index], observation_rotation.flip_single_action(index, cfg))
+        self.assertEqual(expected, observation_rotation.flip_action(np.arange(len(action_set)), cfg))
+        self.assertEqual(expected[1], observation_rotation.flip_single_action(True, cfg))
+        self.assertEqual(expected[1], observation_rotation.flip_single_action(np.int64(1), cfg))
+
 
 if __name__ == "__main__":
     absltest.main()
@@ -251,43 +251,43 @@ class SimpleStateWrapper(gym.ObservationWrapper):
             = 7 * n1 + 6 * n2 + 18
         """
 
-        def do_flatten(obj):
-            """Run flatten on either python list or numpy array."""
-            if isinstance(obj, list):
-                return np.array(obj).flatten()
-            return obj.flatten()
-
-        all_feats = []
-        for obs_dict in observation_dicts:
+        # The dense features are written straight into a preallocated float32 buffer and the one-hot
+        # encodings are set by index, instead of growing a Python list of scalars.
+        all_feats = None
+        for agent_id, obs_dict in enumerate(observation_dicts):
             p_i = obs_dict["active"]
-            feat = []
-            feat.extend(do_flatten(obs_dict["left_team"][p_i]))
-            feat.extend(do_flatten(obs_dict["left_team_direction"][p_i]))
-            feat.extend([obs_dict["sticky_actions"][8], obs_dict["sticky_actions"][9]])
-            feat.extend(do_flatten(np.delete(obs_dict["left_team"], p_i, axis=0) - obs_dict["left_team"][p_i]))
-            feat.extend(do_flatten(obs_dict["right_team"] - obs_dict["left_team"][p_i]))
-            feat.extend(do_flatten(obs_dict["ball"][:2] - obs_dict["left_team"][p_i]))
-
-            feat.extend(do_flatten(np.delete(obs_dict["left_team"], p_i, axis=0)))
-            feat.extend(do_flatten(np.delete(obs_dict["left_team_direction"], p_i, axis=0)))
-            feat.extend(do_flatten(obs_dict["right_team"]))
-            feat.extend(do_flatten(obs_dict["right_team_direction"]))
-
-            feat.extend(do_flatten(obs_dict["ball"]))
-            feat.extend(do_flatten(obs_dict["ball_direction"]))
-            if obs_dict["ball_owned_team"] == -1:
-                feat.extend([1, 0, 0])
-            if obs_dict["ball_owned_team"] == 0:
-                feat.extend([0, 1, 0])
-            if obs_dict["ball_owned_team"] == 1:
-                feat.extend([0, 0, 1])
-
-            feat.extend(do_flatten(np.eye(7)[obs_dict["game_mode"]]))
-            feat.extend(do_flatten(np.eye(len(obs_dict["left_team"]))[p_i]))
-            feat = np.array(feat, dtype=np.float32)
-
-            all_feats.append(feat)
-        return np.stack(all_feats, axis=0)
+            left_team = np.asarray(obs_dict["left_team"])
+            left_team_direction = np.asarray(obs_dict["left_team_direction"])
+            right_team = np.asarray(obs_dict["right_team"])
+            n1, n2 = len(left_team), len(right_team)
+            if all_feats is None:
+                all_feats = np.zeros((len(observation_dicts), 7 * n1 + 6 * n2 + 18), dtype=np.float32)
+            feat = all_feats[agent_id]
+            one_hot_offset = 6 * n1 + 6 * n2 + 8
+
+            player = left_team[p_i]
+            other_left_team = np.delete(left_team, p_i, axis=0)
+            np.concatenate(
+                [
+                    player,
+                    left_team_direction[p_i],
+                    np.asarray(obs_dict["sticky_actions"])[8:10],
+                    (other_left_team - player).ravel(),
+                    (right_team - player).ravel(),
+                    np.asarray(obs_dict["ball"])[:2] - player,
+                    other_left_team.ravel(),
+                    np.delete(left_team_direction, p_i, axis=0).ravel(),
+                    right_team.ravel(),
+                    np.asarray(obs_dict["right_team_direction"]).ravel(),
+                    np.asarray(obs_dict["ball"]).ravel(),
+                    np.asarray(obs_dict["ball_direction"]).ravel(),
+                ],
+                out=feat[:one_hot_offset],
+            )
+            feat[one_hot_offset + 1 + obs_dict["ball_owned_team"]] = 1
+            feat[one_hot_offset + 3 + obs_dict["game_mode"]] = 1
+            feat[one_hot_offset + 10 + p_i] = 1
+        return all_feats
 
 
 class Simple115StateWrapper(gym.ObservationWrapper):
@@ -21,6 +21,8 @@ import gymnasium as gym
 import numpy as np
 from absl.testing import absltest
 
+from gfootball.env import wrappers
+
 
 class SingleAgentWrapperTest(absltest.TestCase):
 
@@ -124,5 +126,96 @@ class SingleAgentWrapperTest(absltest.TestCase):
         env.close()
 
 
+def _list_simple_state(obs_dict):
+    """Frozen copy of the original list-building SimpleStateWrapper features of one agent."""
+    p_i = obs_dict["active"]
+    feat = []
+    feat.extend(np.asarray(obs_dict["left_team"][p_i]).flatten())
+    feat.extend(np.asarray(obs_dict["left_team_direction"][p_i]).flatten())
+    feat.extend([obs_dict["sticky_actions"][8], obs_dict["sticky_actions"][9]])
+    feat.extend((np.delete(obs_dict["left_team"], p_i, axis=0) - obs_dict["left_team"][p_i]).flatten())
+    feat.extend((obs_dict["right_team"] - obs_dict["left_team"][p_i]).flatten())
+    feat.extend((obs_dict["ball"][:2] - obs_dict["left_team"][p_i]).flatten())
+    feat.extend(np.delete(obs_dict["left_team"], p_i, axis=0).flatten())
+    feat.extend(np.delete(obs_dict["left_team_direction"], p_i, axis=0).flatten())
+    feat.extend(obs_dict["right_team"].flatten())
+    feat.extend(obs_dict["right_team_direction"].flatten())
+    feat.extend(obs_dict["ball"].flatten())
+    feat.extend(obs_dict["ball_direction"].flatten())
+    if obs_dict["ball_owned_team"] == -1:
+        feat.extend([1, 0, 0])
+    if obs_dict["ball_owned_team"] == 0:
+        feat.extend([0, 1, 0])
+    if obs_dict["ball_owned_team"] == 1:
+        feat.extend([0, 0, 1])
+    feat.extend(np.eye(7)[obs_dict["game_mode"]])
+    feat.extend(np.eye(len(obs_dict["left_team"]))[p_i])
+    return np.array(feat, dtype=np.float32)
+
+
+class SimpleStateWrapperTest(absltest.TestCase):
+
+    def _observation(self, active, ball_owned_team, game_mode, sticky_actions):
+        return {
+            "left_team": np.array([[0.5, 0.25], [-0.25, 0.125]]),
+            "left_team_direction": np.array([[0.125, -0.125], [0.0625, 0.25]]),
+            "right_team": np.array([[0.75, -0.5]]),
+            "right_team_direction": np.array([[-0.0625, 0.5]]),
+            "ball": np.array([0.25, 0.5, 0.125]),
+            "ball_direction": np.array([0.0, -0.25, 0.5]),
+            "ball_owned_team": ball_owned_team,
+            "game_mode": game_mode,
+            "sticky_actions": np.array([0] * 8 + sticky_actions),
+            "active": active,
+        }
+
+    def test_convert_observation_values(self):
+        observations = [self._observation(1, 0, 3, [1, 0]), self._observation(0, -1, 6, [0, 1])]
+        state = wrappers.SimpleStateWrapper.convert_observation(observations)
+
+        # n1 = 2, n2 = 1: 7 * 2 + 6 * 1 + 18 = 38 features per agent.
+        expected = np.array(
+            [
+                # player, direction, (sprint, dribble), other left - player, right - player, ball - player
+                [-0.25, 0.125, 0.0625, 0.25, 1, 0, 0.75, 0.125, 1.0, -0.625, 0.5, 0.375]
+                # other left, other left direction, right, right direction, ball, ball direction
+                + [0.5, 0.25, 0.125, -0.125, 0.75, -0.5, -0.0625, 0.5, 0.25, 0.5, 0.125, 0.0, -0.25, 0.5]
+                # ball owner (left), game mode 3, active player 1
+                + [0, 1, 0] + [0, 0, 0, 1, 0, 0, 0] + [0, 1],
+                [0.5, 0.25, 0.125, -0.125, 0, 1, -0.75, -0.125, 0.25, -0.75, -0.25, 0.25]
+                + [-0.25, 0.125, 0.0625, 0.25, 0.75, -0.5, -0.0625, 0.5, 0.25, 0.5, 0.125, 0.0, -0.25, 0.5]
+                # ball owner (none), game mode 6, active player 0
+                + [1, 0, 0] + [0, 0, 0, 0, 0, 0, 1] + [1, 0],
+            ],
+            dtype=np.float32,
+        )
+        self.assertEqual(np.float32, state.dtype)
+        np.testing.assert_array_equal(expected, state)
+
+    def _random_observation(self, rng, n1, n2):
+        return {
+            "left_team": rng.uniform(-1, 1, size=(n1, 2)),
+            "left_team_direction": rng.uniform(-0.01, 0.01, size=(n1, 2)),
+            "right_team": rng.uniform(-1, 1, size=(n2, 2)),
+            "right_team_direction": rng.uniform(-0.01, 0.01, size=(n2, 2)),
+            "ball": rng.uniform(-1, 1, size=3),
+            "ball_direction": rng.uniform(-0.01, 0.01, size=3),
+            "ball_owned_team": rng.randint(-1, 2),
+            "game_mode": rng.randint(7),
+            "sticky_actions": rng.randint(2, size=10),
+            "active": rng.randint(n1),
+        }
+
+    def test_convert_observation_matches_list_features(self):
+        rng = np.random.RandomState(0)
+        for n1, n2, n_agents in [(1, 1, 1), (3, 2, 2), (5, 5, 3), (11, 11, 3)]:
+            observations = [self._random_observation(rng, n1, n2) for _ in range(n_agents)]
+            state = wrappers.SimpleStateWrapper.convert_observation(observations)
+
+            self.assertEqual((n_agents, 7 * n1 + 6 * n2 + 18), state.shape)
+            self.assertEqual(np.float32, state.dtype)
+            np.testing.assert_array_equal(np.stack([_list_simple_state(obs) for obs in observations]), state)
+
+
 if __name__ == "__main__":
     absltest.main()
@@ -3,6 +3,7 @@ Google Research Football (GRF) environment for PettingZoo (Parallel) APIs
 
 """
 
+import operator
 from collections.abc import Iterable
 from typing import Any, Dict, List, Tuple, Type
 
@@ -14,11 +15,31 @@ from pettingzoo.utils.env import AgentID
 
 from gfootball.env import create_environment
 
+_SEQUENCE_TYPES = frozenset({list, tuple, np.ndarray})
+_SCALAR_TYPES = frozenset({bool, int, float, np.bool_, np.int32, np.int64, np.float32, np.float64})
+
 
 class ParallelEnv(pettingzoo.ParallelEnv):
     """Petting ParallelEnv for Google Research Football (GRF) environment"""
 
     metadata = {}
+    # The attributes read on every step/reset are stored in slots. pettingzoo's ParallelEnv declares no slots, so
+    # instances still have a `__dict__` and an attribute missing from this list silently lands there.
+    __slots__ = (
+        "_env",
+        "_engine_config",
+        "_control_config",
+        "_single_agent",
+        "_actions_getter",
+        "_enumerated_agents",
+        "_has_reset",
+        "agents",
+        "possible_agents",
+        "agent_name_mapping",
+        "observation_spaces",
+        "action_spaces",
+        "state_space",
+    )
 
     def __init__(
         self,
@@ -152,7 +173,13 @@ class ParallelEnv(pettingzoo.ParallelEnv):
         self.agents = [f"player_{i}" for i in range(self._control_config.number_of_players_agent_controls())]
 
         self.possible_agents = self.agents[:]
-        self.agent_name_mapping = dict(zip(self.possible_agents, list(range(len(self.possible_agents)))))
+        self.agent_name_mapping = dict(zip(self.possible_agents, range(len(self.possible_agents))))
+        self._enumerated_agents = tuple(enumerate(self.possible_agents))
+        # The single-agent env returns unbatched outputs, which step/reset pass through without per-agent indexing.
+        self._single_agent = len(self.possible_agents) == 1
+        # GRF terminates all agents at once, so actions and outputs are always handled for every possible agent.
+        self._actions_getter = operator.itemgetter(*self.possible_agents)
+        self._has_reset = False
 
         if hasattr(self._env.unwrapped, "state_space"):
             self.state_space = self._env.unwrapped.state_space
@@ -190,9 +217,11 @@ class ParallelEnv(pettingzoo.ParallelEnv):
         return len(self.agents)
 
     def _check(self, var: Any) -> Any:
-        if not isinstance(var, Iterable):
-            var = [var] * len(self.agents)
-        return var
+        # Exact type lookups cover the common outputs; the ABC check is only reached for other types.
+        var_type = type(var)
+        if var_type in _SEQUENCE_TYPES or (var_type not in _SCALAR_TYPES and isinstance(var, Iterable)):
+            return var
+        return [var] * len(self.agents)
 
     def step(self, actions: Dict) -> Tuple[
         Dict,
@@ -201,7 +230,12 @@ class ParallelEnv(pettingzoo.ParallelEnv):
         Dict,
         Dict,
     ]:
-        actions_array = [actions[agent] for agent in self.agents]
+        # Stands in for OrderForcingParallelEnvWrapper without an extra wrapper layer; skipped under `python -O`.
+        assert self._has_reset, "Environment must be reset before stepping"
+        if self._single_agent:
+            return self._step_single(actions)
+
+        actions_array = list(self._actions_getter(actions))
         observation_array, reward_array, terminated_array, truncated_array, info_key2array = self._env.step(
             actions_array
         )
@@ -209,35 +243,40 @@ class ParallelEnv(pettingzoo.ParallelEnv):
         reward_array = self._check(reward_array)
         terminated_array = self._check(terminated_array)
         truncated_array = self._check(truncated_array)
+        info_key2array = {k: self._check(v_array) for k, v_array in info_key2array.items()}
 
         observation_dict, reward_dict, terminated_dict, truncated_dict, info_key2dict = {}, {}, {}, {}, {}
-        for agent_id, agent in enumerate(self.agents):
+        for agent_id, agent in self._enumerated_agents:
             observation_dict[agent] = observation_array[agent_id]
             reward_dict[agent] = reward_array[agent_id]
             terminated_dict[agent] = terminated_array[agent_id]
             truncated_dict[agent] = truncated_array[agent_id]
-            info_key2dict[agent] = {}
-
-        for k, v_array in info_key2array.items():
-            v_array = self._check(v_array)
-            for agent_id, agent in enumerate(self.agents):
-                info_key2dict[agent][k] = v_array[agent_id]
+            info_key2dict[agent] = {k: v_array[agent_id] for k, v_array in info_key2array.items()}
 
         self.agents = [agent for agent in self.agents if not (terminated_dict[agent] or truncated_dict[agent])]
 
         return observation_dict, reward_dict, terminated_dict, truncated_dict, info_key2dict
 
+    def _step_single(self, actions: Dict) -> Tuple[Dict, Dict, Dict, Dict, Dict]:
+        agent = self.possible_agents[0]
+        observation, reward, terminated, truncated, info = self._env.step([actions[agent]])
+        if terminated or truncated:
+            self.agents = []
+        return {agent: observation}, {agent: reward}, {agent: terminated}, {agent: truncated}, {agent: info}
+
     def reset(self, seed: int | None = None, options: Dict | None = None) -> Tuple[Dict, Dict]:
         observation_array, info_key2array = self._env.reset(seed=seed, options=options)
+        self._has_reset = True
         self.agents = self.possible_agents[:]
+        if self._single_agent:
+            return {self.agents[0]: observation_array}, {self.agents[0]: info_key2array}
+
+        info_key2array = {k: self._check(v_array) for k, v_array in info_key2array.items()}
+
         observation_dict, info_key2dict = {}, {}
-        for agent_id, agent in enumerate(self.agents):
+        for agent_id, agent in self._enumerated_agents:
             observation_dict[agent] = observation_array[agent_id]
-            info_key2dict[agent] = {}
-        for k, v_array in info_key2array.items():
-            v_array = self._check(v_array)
-            for agent_id, agent in enumerate(self.agents):
-                info_key2dict[agent][k] = v_array[agent_id]
+            info_key2dict[agent] = {k: v_array[agent_id] for k, v_array in info_key2array.items()}
 
         return observation_dict, info_key2dict
 
@@ -263,7 +302,7 @@ def parallel_env(
     number_of_left_players_agent_controls: int = 1,
     number_of_right_players_agent_controls: int = 0,
     other_config_options: dict = {},
-    order_forcing: bool = True,
+    order_forcing: bool = False,
     agent_state: bool = True,
     additional_wrappers: List[Type[pettingzoo.utils.BaseParallelWrapper]] = [],
 ) -> ParallelEnv:
@@ -272,6 +311,9 @@ def parallel_env(
     ----------
     order_forcing : bool
         Whether to use the OrderForcingParallelEnvWrapper.
+        The wrapper is off by default to save a layer of dispatch per call. ParallelEnv itself only asserts that
+        `reset` is called before the first `step`; the other call-order checks of the wrapper are not made, and
+        the assertion is skipped under `python -O`. Enable the wrapper to keep the full checks.
     agent_state : bool
         Whether to use the AgentStateParallelEnvWrapper, if possible.
     """
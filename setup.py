@@ -193,6 +193,7 @@ setup(
         "co-mas @ git+https://github.com/xihuai18/Common-Multi-agent-Environments.git",
         "pre-commit",
     ],
+    extras_require={"test": ["pytest", "pytest-xdist"]},
     include_package_data=True,
     keywords="gfootball reinforcement-learning python machine learning",
     ext_modules=[CMakeExtension("brainball_cpp_engine")],
@@ -1,94 +1,153 @@
-from co_mas.test.parallel_api import parallel_api_test, sample_action
-from loguru import logger
+import hashlib
+import random
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from co_mas.test.parallel_api import parallel_api_test
+from co_mas.wrappers import AutoResetParallelEnvWrapper, OrderForcingParallelEnvWrapper
 
 from gfootball import gfootball_pettingzoo_v1
 
-# API Tests
-env = gfootball_pettingzoo_v1.parallel_env(
-    "academy_3_vs_1_with_keeper", representation="simplev1", number_of_left_players_agent_controls=2
-)
-parallel_api_test(env, 400, agent_state=True)
 
-# Seed Tests
-env1 = gfootball_pettingzoo_v1.parallel_env(
-    "academy_3_vs_1_with_keeper", representation="simplev1", number_of_left_players_agent_controls=2
-)
+def set_pkg_seed(seed):
+    """Seeds the global `random` and `numpy` generators, which the scenario builder draws from."""
+    random.seed(seed)
+    np.random.seed(seed)
+
+
+def make_action_sampler(env, seed, block_size=512):
+    """Returns a function giving the actions of all agents, drawn from a generator seeded by `seed`.
+
+    Actions are drawn `block_size` steps at a time, so the generator is called once per block rather than per step.
+    """
+    agents = tuple(env.possible_agents)
+    n_actions = [env.action_space(agent).n for agent in agents]
+    rng = np.random.default_rng(seed)
+
+    def actions():
+        while True:
+            for row in rng.integers(0, n_actions, size=(block_size, len(agents))).tolist():
+                yield dict(zip(agents, row))
+
+    return actions().__next__
+
 
-obs1_list = []
-obs1, info1 = env1.reset(seed=42)
-obs1_list.append(obs1)
+def seeded_rollout(env, seed, max_steps=400, reference=None):
+    """Resets `env` with `seed` and plays one episode (at most `max_steps` steps) with actions drawn from `seed`.
 
-while True:
-    obs1, _, terminated1, _, info1 = env1.step(
-        {agent: sample_action(agent, obs1[agent], info1[agent], env1.action_space(agent)) for agent in env1.agents}
+    Returns a digest of the observations of all agents at every step, and the reset infos. If `reference` holds the
+    digests of a previous rollout, each step is checked against it as it is played, so a divergence fails at its
+    first step and reports the observations there.
+    """
+    set_pkg_seed(seed)
+    obs, info = env.reset(seed=seed)
+    agents, sample_actions = tuple(env.possible_agents), make_action_sampler(env, seed)
+    # Observations are hashed as float32 whatever the representation; the cast is identical on both runs.
+    row = np.empty((len(agents),) + env.observation_space(agents[0]).shape, dtype=np.float32)
+    digests = []
+
+    def record(t, obs):
+        np.stack([obs[agent] for agent in agents], out=row)
+        digests.append(hashlib.blake2b(row, digest_size=8).digest())
+        if reference is not None:
+            assert t < len(reference), f"Episode outlasts the reference at step {t}"
+            assert digests[t] == reference[t], f"Observations first differ at step {t}: {row}"
+
+    record(0, obs)
+    t = 0
+    while t < max_steps:
+        obs, _, terminated, _, _ = env.step(sample_actions())
+        t += 1
+        record(t, obs)
+
+        if np.fromiter(terminated.values(), dtype=bool, count=len(terminated)).any():
+            break
+
+    if reference is not None:
+        assert len(digests) == len(reference), f"Episode lengths differ: {len(reference)} {len(digests)}"
+    return digests, info
+
+
+def make_env(n_ctrl=2):
+    return gfootball_pettingzoo_v1.parallel_env(
+        "academy_3_vs_1_with_keeper", representation="simplev1", number_of_left_players_agent_controls=n_ctrl
     )
-    obs1_list.append(obs1)
 
-    if any(terminated1.values()):
-        break
 
-env1.close()
+@pytest.fixture(scope="module")
+def env():
+    """One env, and so one engine, shared by the wrapper tests of a worker; each test adds its wrappers on top of it."""
+    env = make_env()
+    yield env
+    env.close()
 
-env2 = gfootball_pettingzoo_v1.parallel_env(
-    "academy_3_vs_1_with_keeper", representation="simplev1", number_of_left_players_agent_controls=2
-)
 
-obs2_list = []
-obs2, info2 = env2.reset(seed=42)
-obs2_list.append(obs2)
+# The single-agent env shares the API surface of the two-agent one except for the step/reset fast path,
+# which a short run covers.
+@pytest.mark.parametrize("n_ctrl, num_cycles", [(1, 50), (2, 400)])
+def test_api(n_ctrl, num_cycles):
+    env = make_env(n_ctrl)
+    # parallel_api_test samples the action spaces, whose generators env.reset(seed=...) leaves untouched.
+    set_pkg_seed(42)
+    for agent in env.possible_agents:
+        env.action_space(agent).seed(42)
+    parallel_api_test(env, num_cycles, agent_state=True)
+    env.close()
 
-while True:
-    obs2, _, terminated2, _, _ = env2.step({agent: env2.action_space(agent).sample() for agent in env2.agents})
-    obs2_list.append(obs2)
 
-    if any(terminated2.values()):
-        break
-env2.close()
+def test_seed_determinism():
+    # Two separately built envs: both stay open so the second does not reuse the first one's pooled engine.
+    env1, env2 = make_env(), make_env()
+    digests, info1 = seeded_rollout(env1, 42)
+    _, info2 = seeded_rollout(env2, 42, reference=digests)
+    env1.close()
+    env2.close()
 
-for i, (obs1, obs2) in enumerate(zip(obs1_list, obs2_list)):
-    assert all(obs1[agent] == obs2[agent] for agent in env1.agents), f"Observations at step {i} differ: {obs1} {obs2}"
+    for agent in env1.possible_agents:
+        assert info1[agent].keys() == info2[agent].keys(), f"Reset infos differ: {info1} {info2}"
+        for k in info1[agent]:
+            assert np.array_equal(info1[agent][k], info2[agent][k]), f"Reset infos differ: {info1} {info2}"
 
-logger.success("Seed test passed!")
 
-# Wrapper Tests
-from co_mas.wrappers import AutoResetParallelEnvWrapper, OrderForcingParallelEnvWrapper
+def test_step_before_reset():
+    # Without OrderForcingParallelEnvWrapper, ParallelEnv's own assertion guards the call order.
+    env = make_env()
+    sample_actions = make_action_sampler(env, 42)
+
+    with pytest.raises(AssertionError, match="Environment must be reset before stepping"):
+        env.unwrapped.step(sample_actions())
+    env.close()
 
-env = gfootball_pettingzoo_v1.parallel_env(
-    "academy_3_vs_1_with_keeper",
-    representation="simplev1",
-    number_of_left_players_agent_controls=2,
-    additional_wrappers=[OrderForcingParallelEnvWrapper],
-)
 
-try:
-    env.step({agent: env.action_space(agent).sample() for agent in env.agents})
-except Exception as e:
-    assert str(e) == "Environment must be reset before stepping", e
-    logger.success("Order Forcing Test Passed!")
-else:
-    raise AssertionError("Expected reset error")
+def test_order_forcing(env):
+    env = OrderForcingParallelEnvWrapper(env)
+    sample_actions = make_action_sampler(env, 42)
 
+    with pytest.raises(Exception, match="Environment must be reset before stepping"):
+        env.step(sample_actions())
 
-env = gfootball_pettingzoo_v1.parallel_env(
-    "academy_3_vs_1_with_keeper",
-    representation="simplev1",
-    number_of_left_players_agent_controls=2,
-    additional_wrappers=[OrderForcingParallelEnvWrapper, AutoResetParallelEnvWrapper],
-)
 
-env.reset(seed=42)
+def test_auto_reset(env):
+    env = AutoResetParallelEnvWrapper(OrderForcingParallelEnvWrapper(env))
+    env.reset(seed=42)
+    sample_actions = make_action_sampler(env, 42)
+    all_true = dict.fromkeys(env.possible_agents, True)
 
-while True:
-    _, _, terminated, _, _ = env.step({agent: env.action_space(agent).sample() for agent in env.agents})
+    with patch.object(env.unwrapped, "reset", wraps=env.unwrapped.reset) as reset:
+        while True:
+            _, _, terminated, _, _ = env.step(sample_actions())
 
-    if all(terminated.values()):
-        break
+            if terminated == all_true:
+                break
 
-_, _, terminated, _, _ = env.step({agent: env.action_space(agent).sample() for agent in env.agents})
+        if not reset.called:
+            # The wrapper may defer the reset to the step following termination.
+            env.step(sample_actions())
 
-assert terminated != {agent: True for agent in env.agents}
+    assert reset.called, "AutoResetParallelEnvWrapper did not reset the environment"
 
-logger.success("Auto Reset Test Passed!")
 
-logger.success("Wrapper Test Passed!")
-env.close()
+if __name__ == "__main__":
+    # The tests are independent: `pytest -n auto` spreads them over worker processes.
+    raise SystemExit(pytest.main([__file__, "-n", "auto"]))